@@ -1,5 +1,10 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
+import os
+from typing import Any, Dict, List, Optional
+from cachetools import TTLCache
+from sqlalchemy import Integer, any_, bindparam, delete, func, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 import logging
 
@@ -7,16 +12,117 @@ from src.api import models, schemas
 
 logger = logging.getLogger("cloud-devops-api.crud")
 
+# PostgreSQL SQLSTATE for unique_violation
+UNIQUE_VIOLATION = "23505"
+
+# In-process cache of product rows served by GET /products/{id}
+PRODUCT_CACHE_SIZE = int(os.getenv("PRODUCT_CACHE_SIZE", "10000"))
+PRODUCT_CACHE_TTL = int(os.getenv("PRODUCT_CACHE_TTL", "60"))  # seconds
+_product_cache: TTLCache = TTLCache(maxsize=PRODUCT_CACHE_SIZE, ttl=PRODUCT_CACHE_TTL)
+# Bumped on every invalidation so a read that raced a write doesn't re-cache a stale row
+_cache_generation = 0
+
+# Statements are built once at import time so every call reuses the same
+# compiled form from the engine's query cache; values are passed as bind params.
+# Read statements use raiseload("*") so any relationship added to Product must be
+# loaded explicitly (e.g. selectinload) instead of lazily per row during serialization.
+_GET_PRODUCT_BY_ID = (
+    select(models.Product)
+    .options(raiseload("*"))
+    .where(models.Product.id == bindparam("product_id"))
+)
+_LIST_PRODUCTS = (
+    select(models.Product)
+    .options(raiseload("*"))
+    .order_by(models.Product.id)
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+)
+_LIST_PRODUCTS_AFTER = _LIST_PRODUCTS.where(models.Product.id > bindparam("after_id"))
+# Column-level variant for read-only listing: rows are returned as plain mappings
+_PRODUCT_COLUMNS = (
+    models.Product.id,
+    models.Product.name,
+    models.Product.description,
+    models.Product.price,
+    models.Product.created_at,
+    models.Product.updated_at,
+)
+_LIST_PRODUCT_ROWS = (
+    select(*_PRODUCT_COLUMNS)
+    .order_by(models.Product.id)
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+)
+_LIST_PRODUCT_ROWS_AFTER = _LIST_PRODUCT_ROWS.where(models.Product.id > bindparam("after_id"))
+# id = ANY(:ids) keeps one SQL text (and prepared statement) for any number of IDs
+_GET_PRODUCT_ROWS_BY_IDS = select(*_PRODUCT_COLUMNS).where(
+    models.Product.id == any_(bindparam("ids", type_=ARRAY(Integer)))
+)
+# Bulk writes run as executemany, which SQLAlchemy batches into multi-row
+# INSERT ... VALUES (...), (...) statements; duplicate names are resolved by ON CONFLICT
+_BULK_INSERT_PRODUCTS = (
+    pg_insert(models.Product)
+    .on_conflict_do_nothing(index_elements=[models.Product.name])
+    .returning(*_PRODUCT_COLUMNS)
+)
+_upsert = pg_insert(models.Product)
+_BULK_UPSERT_PRODUCTS = _upsert.on_conflict_do_update(
+    index_elements=[models.Product.name],
+    set_={
+        "description": _upsert.excluded.description,
+        "price": _upsert.excluded.price,
+        "updated_at": func.now(),
+    },
+).returning(*_PRODUCT_COLUMNS)
+_DELETE_PRODUCT = delete(models.Product).where(models.Product.id == bindparam("product_id"))
+
 class ProductAlreadyExistsError(Exception):
     """Raised when attempting to create a product with a name that already exists."""
     pass
 
-def create_product(db: Session, product: schemas.ProductCreate) -> models.Product:
+def get_cached_product(product_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Look up a product row in the in-process cache.
+
+    Args:
+        product_id (int): Product ID.
+
+    Returns:
+        dict or None: Cached product row, or None on a cache miss.
+    """
+    return _product_cache.get(product_id)
+
+def invalidate_cached_product(product_id: int) -> None:
+    """
+    Drop a product from the in-process cache after it was modified or deleted.
+
+    Args:
+        product_id (int): Product ID.
+    """
+    global _cache_generation
+    _cache_generation += 1
+    _product_cache.pop(product_id, None)
+
+def _is_unique_violation(exc: IntegrityError) -> bool:
+    """
+    Check whether an IntegrityError was caused by a unique constraint violation.
+
+    Args:
+        exc (IntegrityError): Error raised by the database driver.
+
+    Returns:
+        bool: True if the underlying SQLSTATE is unique_violation.
+    """
+    code = getattr(exc.orig, "pgcode", None) or getattr(exc.orig, "sqlstate", None)
+    return code == UNIQUE_VIOLATION
+
+async def create_product(db: AsyncSession, product: schemas.ProductCreate) -> models.Product:
     """
     Create a new product in the database.
 
     Args:
-        db (Session): SQLAlchemy session.
+        db (AsyncSession): SQLAlchemy async session.
         product (ProductCreate): Product creation schema.
 
     Returns:
@@ -26,12 +132,7 @@ def create_product(db: Session, product: schemas.ProductCreate) -> models.Produc
         ProductAlreadyExistsError: If a product with the same name already exists.
         SQLAlchemyError: For other database errors.
     """
-    # Check for existing product with the same name
-    existing = db.query(models.Product).filter(models.Product.name == product.name).first()
-    if existing:
-        logger.warning(f"Product creation failed: name '{product.name}' already exists.")
-        raise ProductAlreadyExistsError(f"Product with name '{product.name}' already exists.")
-
+    # Name uniqueness is enforced by the unique index on products.name
     db_product = models.Product(
         name=product.name,
         description=product.description,
@@ -39,124 +140,250 @@ def create_product(db: Session, product: schemas.ProductCreate) -> models.Produc
     )
     try:
         db.add(db_product)
-        db.commit()
-        db.refresh(db_product)
-        logger.info(f"Product created: {db_product}")
+        await db.commit()
+        logger.info("Product created: %r", db_product)
         return db_product
     except IntegrityError as e:
-        db.rollback()
-        logger.error(f"Integrity error during product creation: {e}")
+        await db.rollback()
+        if not _is_unique_violation(e):
+            logger.error("Integrity error during product creation: %s", e)
+            raise
+        logger.warning("Product creation failed: name '%s' already exists.", product.name)
         raise ProductAlreadyExistsError(f"Product with name '{product.name}' already exists.")
     except SQLAlchemyError as e:
-        db.rollback()
-        logger.error(f"Database error during product creation: {e}")
+        await db.rollback()
+        logger.error("Database error during product creation: %s", e)
+        raise
+
+def _bulk_rows(products: List[schemas.ProductCreate]) -> List[Dict[str, Any]]:
+    # A statement can't touch the same conflicting row twice, so the last entry per name wins
+    rows = {product.name: product.model_dump() for product in products}
+    return list(rows.values())
+
+async def create_products_bulk(db: AsyncSession, products: List[schemas.ProductCreate]) -> List[Dict[str, Any]]:
+    """
+    Create several products at once, skipping names that already exist.
+
+    Args:
+        db (AsyncSession): SQLAlchemy async session.
+        products (List[ProductCreate]): Product creation schemas.
+
+    Returns:
+        List[dict]: Rows of the products that were created.
+
+    Raises:
+        SQLAlchemyError: For database errors.
+    """
+    try:
+        conn = await db.connection()
+        result = await conn.execute(_BULK_INSERT_PRODUCTS, _bulk_rows(products))
+        created = [dict(row) for row in result.mappings()]
+        await db.commit()
+    except SQLAlchemyError as e:
+        await db.rollback()
+        logger.error("Database error during bulk product creation: %s", e)
+        raise
+    logger.info("Bulk created %s of %s products", len(created), len(products))
+    return created
+
+async def upsert_products_bulk(db: AsyncSession, products: List[schemas.ProductCreate]) -> List[Dict[str, Any]]:
+    """
+    Create or update several products at once, matching existing products by name.
+
+    Args:
+        db (AsyncSession): SQLAlchemy async session.
+        products (List[ProductCreate]): Product schemas; existing products get their
+            description and price replaced.
+
+    Returns:
+        List[dict]: Rows of the products that were created or updated.
+
+    Raises:
+        SQLAlchemyError: For database errors.
+    """
+    try:
+        conn = await db.connection()
+        result = await conn.execute(_BULK_UPSERT_PRODUCTS, _bulk_rows(products))
+        upserted = [dict(row) for row in result.mappings()]
+        await db.commit()
+    except SQLAlchemyError as e:
+        await db.rollback()
+        logger.error("Database error during bulk product upsert: %s", e)
         raise
+    for product in upserted:
+        invalidate_cached_product(product["id"])
+    logger.info("Bulk upserted %s products", len(upserted))
+    return upserted
 
-def get_products(db: Session, skip: int = 0, limit: int = 100) -> List[models.Product]:
+async def get_products(
+    db: AsyncSession, skip: int = 0, limit: int = 100, after_id: Optional[int] = None
+) -> List[models.Product]:
     """
-    Retrieve a list of products from the database.
+    Retrieve a list of products from the database, ordered by ID.
+
+    Keyset pagination via ``after_id`` should be preferred over ``skip``:
+    it resumes from an index range scan on the primary key instead of
+    reading and discarding ``skip`` rows on every page.
 
     Args:
-        db (Session): SQLAlchemy session.
+        db (AsyncSession): SQLAlchemy async session.
         skip (int): Number of records to skip.
         limit (int): Maximum number of records to return.
+        after_id (int, optional): Only return products with an ID greater than this.
 
     Returns:
         List[Product]: List of Product model instances.
     """
-    products = db.query(models.Product).order_by(models.Product.id).offset(skip).limit(limit).all()
-    logger.debug(f"Fetched {len(products)} products (skip={skip}, limit={limit})")
+    if after_id is None:
+        result = await db.execute(_LIST_PRODUCTS, {"skip": skip, "limit": limit})
+    else:
+        result = await db.execute(_LIST_PRODUCTS_AFTER, {"after_id": after_id, "skip": skip, "limit": limit})
+    products = result.scalars().all()
+    logger.debug("Fetched %s products (after_id=%s, skip=%s, limit=%s)", len(products), after_id, skip, limit)
     return products
 
-def get_product(db: Session, product_id: int) -> Optional[models.Product]:
+async def get_products_raw(
+    db: AsyncSession, skip: int = 0, limit: int = 100, after_id: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Retrieve a list of products as plain dicts, ordered by ID.
+
+    Runs a Core select on the session's connection, skipping ORM instance
+    construction and identity-map registration. Use for read-only listing;
+    use get_products when the instances will be modified.
+
+    Args:
+        db (AsyncSession): SQLAlchemy async session.
+        skip (int): Number of records to skip.
+        limit (int): Maximum number of records to return.
+        after_id (int, optional): Only return products with an ID greater than this.
+
+    Returns:
+        List[dict]: One dict per product, keyed by column name.
+    """
+    conn = await db.connection()
+    if after_id is None:
+        result = await conn.execute(_LIST_PRODUCT_ROWS, {"skip": skip, "limit": limit})
+    else:
+        result = await conn.execute(_LIST_PRODUCT_ROWS_AFTER, {"after_id": after_id, "skip": skip, "limit": limit})
+    products = [dict(row) for row in result.mappings()]
+    logger.debug("Fetched %s product rows (after_id=%s, skip=%s, limit=%s)", len(products), after_id, skip, limit)
+    return products
+
+async def get_product(db: AsyncSession, product_id: int) -> Optional[models.Product]:
     """
     Retrieve a product by its ID.
 
     Args:
-        db (Session): SQLAlchemy session.
+        db (AsyncSession): SQLAlchemy async session.
         product_id (int): Product ID.
 
     Returns:
         Product or None: Product model instance if found, else None.
     """
-    product = db.query(models.Product).filter(models.Product.id == product_id).first()
+    result = await db.execute(_GET_PRODUCT_BY_ID, {"product_id": product_id})
+    product = result.scalar_one_or_none()
     if product:
-        logger.debug(f"Product found: {product}")
+        logger.debug("Product found: %r", product)
     else:
-        logger.debug(f"Product not found: id={product_id}")
+        logger.debug("Product not found: id=%s", product_id)
     return product
 
-def update_product(db: Session, product_id: int, product_update: schemas.ProductUpdate) -> Optional[models.Product]:
+async def get_products_by_ids(db: AsyncSession, product_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """
+    Retrieve several products by ID with a single query and cache the rows found.
+
+    Args:
+        db (AsyncSession): SQLAlchemy async session.
+        product_ids (List[int]): Product IDs to look up.
+
+    Returns:
+        Dict[int, dict]: Product rows keyed by ID; missing IDs are absent.
+    """
+    generation = _cache_generation
+    conn = await db.connection()
+    result = await conn.execute(_GET_PRODUCT_ROWS_BY_IDS, {"ids": product_ids})
+    products = {row["id"]: dict(row) for row in result.mappings()}
+    if generation == _cache_generation:
+        _product_cache.update(products)
+    logger.debug("Fetched %s of %s products by id", len(products), len(product_ids))
+    return products
+
+async def update_product(db: AsyncSession, product_id: int, product_update: schemas.ProductUpdate) -> Optional[models.Product]:
     """
     Update an existing product by its ID.
 
+    The row is located, modified and returned by a single
+    ``UPDATE ... WHERE id = :id RETURNING ...`` statement.
+
     Args:
-        db (Session): SQLAlchemy session.
+        db (AsyncSession): SQLAlchemy async session.
         product_id (int): Product ID.
         product_update (ProductUpdate): Product update schema.
 
     Returns:
         Product or None: Updated Product model instance if found, else None.
+
+    Raises:
+        ProductAlreadyExistsError: If another product already uses the new name.
+        SQLAlchemyError: For other database errors.
     """
-    product = db.query(models.Product).filter(models.Product.id == product_id).first()
-    if not product:
-        logger.warning(f"Product not found for update: id={product_id}")
-        return None
-
-    # Update fields if provided
-    if product_update.name is not None:
-        # Check for name uniqueness
-        existing = db.query(models.Product).filter(
-            models.Product.name == product_update.name,
-            models.Product.id != product_id
-        ).first()
-        if existing:
-            logger.warning(f"Product update failed: name '{product_update.name}' already exists.")
-            raise ProductAlreadyExistsError(f"Product with name '{product_update.name}' already exists.")
-        product.name = product_update.name
-    if product_update.description is not None:
-        product.description = product_update.description
-    if product_update.price is not None:
-        product.price = product_update.price
+    # Only fields that were provided are updated
+    values = product_update.model_dump(exclude_none=True)
+    if not values:
+        return await get_product(db, product_id)
 
+    stmt = (
+        update(models.Product)
+        .where(models.Product.id == product_id)
+        .values(**values)
+        .returning(models.Product)
+    )
     try:
-        db.commit()
-        db.refresh(product)
-        logger.info(f"Product updated: {product}")
+        product = (await db.execute(stmt)).scalar_one_or_none()
+        if not product:
+            logger.warning("Product not found for update: id=%s", product_id)
+            return None
+        await db.commit()
+        invalidate_cached_product(product_id)
+        logger.info("Product updated: %r", product)
         return product
     except IntegrityError as e:
-        db.rollback()
-        logger.error(f"Integrity error during product update: {e}")
+        await db.rollback()
+        if not _is_unique_violation(e):
+            logger.error("Integrity error during product update: %s", e)
+            raise
+        logger.warning("Product update failed: name '%s' already exists.", product_update.name)
         raise ProductAlreadyExistsError(f"Product with name '{product_update.name}' already exists.")
     except SQLAlchemyError as e:
-        db.rollback()
-        logger.error(f"Database error during product update: {e}")
+        await db.rollback()
+        logger.error("Database error during product update: %s", e)
         raise
 
-def delete_product(db: Session, product_id: int) -> bool:
+async def delete_product(db: AsyncSession, product_id: int) -> bool:
     """
-    Delete a product by its ID.
+    Delete a product by its ID with a single DELETE statement.
 
     Args:
-        db (Session): SQLAlchemy session.
+        db (AsyncSession): SQLAlchemy async session.
         product_id (int): Product ID.
 
     Returns:
         bool: True if deleted, False if not found.
     """
-    product = db.query(models.Product).filter(models.Product.id == product_id).first()
-    if not product:
-        logger.warning(f"Product not found for deletion: id={product_id}")
-        return False
-
     try:
-        db.delete(product)
-        db.commit()
-        logger.info(f"Product deleted: id={product_id}")
-        return True
+        result = await db.execute(_DELETE_PRODUCT, {"product_id": product_id})
+        await db.commit()
+        invalidate_cached_product(product_id)
     except SQLAlchemyError as e:
-        db.rollback()
-        logger.error(f"Database error during product deletion: {e}")
+        await db.rollback()
+        logger.error("Database error during product deletion: %s", e)
         raise
 
-# Exported: create_product, get_products, get_product, update_product, delete_product, ProductAlreadyExistsError
\ No newline at end of file
+    if result.rowcount == 0:
+        logger.warning("Product not found for deletion: id=%s", product_id)
+        return False
+    logger.info("Product deleted: id=%s", product_id)
+    return True
+
+# Exported: create_product, create_products_bulk, upsert_products_bulk, get_products, get_products_raw, get_product, get_products_by_ids, update_product, delete_product, get_cached_product, invalidate_cached_product, ProductAlreadyExistsError
\ No newline at end of file
@@ -1,7 +1,8 @@
 import os
 import logging
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.engine.url import URL
 
@@ -17,43 +18,107 @@ DB_HOST = os.getenv("POSTGRES_HOST", "localhost")
 DB_PORT = os.getenv("POSTGRES_PORT", "5432")
 DB_NAME = os.getenv("POSTGRES_DB", "cloud_devops_db")
 
+# Connection pool settings
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "25"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "25"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))  # seconds
+# Pre-ping costs a round trip per checkout; recycling handles stale connections instead
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "false").lower() in ("1", "true", "yes")
+# Per-connection LRU of server-side prepared statements kept by asyncpg
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "500"))
+
 DATABASE_URL = (
-    f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+    f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 )
 
-# Create SQLAlchemy engine
-try:
-    engine = create_engine(
-        DATABASE_URL,
-        pool_pre_ping=True,
-        pool_size=10,
-        max_overflow=20,
-        echo=False,  # Set to True for SQL debug logs
-        future=True
+def make_engine(url: str = DATABASE_URL) -> AsyncEngine:
+    """
+    Create the SQLAlchemy async engine and its connection pool.
+
+    Engines are created per process (see the FastAPI lifespan in main.py) rather
+    than at import time, so workers forked after import never share pooled sockets.
+
+    Args:
+        url (str): Database URL.
+
+    Returns:
+        AsyncEngine: Configured async engine.
+    """
+    try:
+        engine = create_async_engine(
+            url,
+            pool_pre_ping=DB_POOL_PRE_PING,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_recycle=DB_POOL_RECYCLE,
+            pool_timeout=DB_POOL_TIMEOUT,
+            query_cache_size=1200,  # Compiled statement cache shared across requests
+            connect_args={"prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE},
+            echo=False,  # Set to True for SQL debug logs
+        )
+        logger.info("Database engine created successfully.")
+        return engine
+    except SQLAlchemyError as e:
+        logger.error("Failed to create database engine: %s", e)
+        raise
+
+def make_sessionmaker(engine: AsyncEngine) -> async_sessionmaker:
+    """
+    Create a configured "AsyncSession" factory bound to an engine.
+
+    Args:
+        engine (AsyncEngine): Engine the sessions use.
+
+    Returns:
+        async_sessionmaker: AsyncSession factory.
+    """
+    return async_sessionmaker(
+        bind=engine,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False,  # Keep RETURNING-populated attributes loaded after commit
     )
-    logger.info("Database engine created successfully.")
-except SQLAlchemyError as e:
-    logger.error(f"Failed to create database engine: {e}")
-    raise
-
-# Create a configured "Session" class
-SessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    bind=engine,
-    future=True
-)
 
-def init_db() -> None:
+async def init_db(engine: Optional[AsyncEngine] = None) -> None:
     """
     Initialize the database by creating all tables.
     Should be called at application startup or migration.
+
+    Args:
+        engine (AsyncEngine, optional): Engine to use; a temporary one is created if omitted.
     """
+    owned_engine = engine is None
+    if owned_engine:
+        engine = make_engine()
     try:
-        Base.metadata.create_all(bind=engine)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
         logger.info("Database tables created or verified successfully.")
     except SQLAlchemyError as e:
-        logger.error(f"Error initializing database: {e}")
+        logger.error("Error initializing database: %s", e)
         raise
+    finally:
+        if owned_engine:
+            await engine.dispose()
+
+def get_pool_status(engine: AsyncEngine) -> dict:
+    """
+    Report connection pool usage so saturation is visible to probes.
+
+    Args:
+        engine (AsyncEngine): Engine whose pool is inspected.
+
+    Returns:
+        dict: Pool size, checked-in/out connections and current overflow.
+    """
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "max_overflow": DB_MAX_OVERFLOW,
+    }
 
-# Exported: engine, SessionLocal, init_db
\ No newline at end of file
+# Exported: make_engine, make_sessionmaker, init_db, get_pool_status
\ No newline at end of file
@@ -0,0 +1,75 @@
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api import crud
+
+logger = logging.getLogger("cloud-devops-api.loaders")
+
+class ProductLoader:
+    """
+    Coalesces concurrent product lookups by ID into a single query.
+
+    Every ``load`` issued during the same event loop iteration is queued and
+    then resolved by one ``WHERE id = ANY(:ids)`` statement, so a burst of
+    concurrent ``GET /products/{id}`` requests costs one round trip instead
+    of one per request. IDs already in the crud product cache are answered
+    without a query. Products are returned as plain dicts, which makes a
+    single result safe to hand to several requests.
+    """
+
+    def __init__(self, session_factory: Callable[[], AsyncSession]):
+        """
+        Args:
+            session_factory (Callable): Factory producing the AsyncSession used for each batch.
+        """
+        self._session_factory = session_factory
+        self._pending: Dict[int, List[asyncio.Future]] = {}
+        self._dispatch_task: Optional[asyncio.Task] = None
+
+    async def load(self, product_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Load a product by ID as part of the current batch.
+
+        Args:
+            product_id (int): Product ID.
+
+        Returns:
+            dict or None: Product row if found, else None.
+        """
+        cached = crud.get_cached_product(product_id)
+        if cached is not None:
+            return cached
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(product_id, []).append(future)
+        if self._dispatch_task is None:
+            # The task first runs after the callbacks already queued in this loop
+            # iteration, so every concurrent request gets to enqueue its ID
+            self._dispatch_task = loop.create_task(self._dispatch())
+        return await future
+
+    async def _dispatch(self) -> None:
+        pending, self._pending = self._pending, {}
+        self._dispatch_task = None
+        try:
+            async with self._session_factory() as db:
+                products = await crud.get_products_by_ids(db, list(pending))
+        except Exception as e:
+            logger.error("Batched product load failed for ids=%s: %s", list(pending), e)
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        for product_id, futures in pending.items():
+            product = products.get(product_id)
+            for future in futures:
+                if not future.done():
+                    future.set_result(product)
+
+# Exported: ProductLoader
\ No newline at end of file
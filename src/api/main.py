@@ -1,61 +1,134 @@
 import logging
-from fastapi import FastAPI, Depends, HTTPException, status
-from fastapi.responses import JSONResponse
+import os
+from contextlib import asynccontextmanager
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import orjson
+from fastapi import FastAPI, Depends, Header, HTTPException, Request, Response, status
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api import models, schemas, crud, database
+from src.api.loaders import ProductLoader
 
-# Configure logging
+# Configure logging (set DEBUG=1 to enable debug logs)
+DEBUG = os.getenv("DEBUG", "0").lower() in ("1", "true", "yes")
+LOG_LEVEL = logging.DEBUG if DEBUG else logging.INFO
 logging.basicConfig(
-    level=logging.INFO,
+    level=LOG_LEVEL,
     format="%(asctime)s %(levelname)s %(name)s %(message)s"
 )
 logger = logging.getLogger("cloud-devops-api")
+# Pin the CRUD logger so per-call debug logging stays off unless DEBUG is set
+logging.getLogger("cloud-devops-api.crud").setLevel(LOG_LEVEL)
+
+def _orjson_default(obj: Any) -> Any:
+    # Match Pydantic's JSON output: Decimal is serialized as a string
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+class APIJSONResponse(ORJSONResponse):
+    """
+    ORJSONResponse that also handles Decimal and emits UTC datetimes with a "Z" suffix,
+    so plain dicts serialize the same way as Pydantic response models.
+    """
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_UTC_Z)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Create the engine, session factory and product loader when a worker starts,
+    and close the connection pool when it shuts down.
+    """
+    app.state.engine = database.make_engine()
+    app.state.sessionmaker = database.make_sessionmaker(app.state.engine)
+    # Process-wide loader so concurrent lookups by ID share one query
+    app.state.product_loader = ProductLoader(app.state.sessionmaker)
+    try:
+        yield
+    finally:
+        await app.state.engine.dispose()
+        logger.info("Database engine disposed.")
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Cloud DevOps Automation Platform - Product API",
     description="RESTful API for managing products as part of the Cloud DevOps Automation Platform.",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=APIJSONResponse,
+    lifespan=lifespan
 )
 
-# CORS configuration (adjust origins as needed for security)
+# CORS configuration: comma-separated origins, e.g. "https://app.example.com,https://admin.example.com"
+CORS_ALLOW_ORIGINS = [
+    origin.strip() for origin in os.getenv("CORS_ALLOW_ORIGINS", "*").split(",") if origin.strip()
+]
+CORS_ALLOW_ALL_ORIGINS = "*" in CORS_ALLOW_ORIGINS
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Restrict in production
-    allow_credentials=True,
-    allow_methods=["*"],
+    allow_origins=["*"] if CORS_ALLOW_ALL_ORIGINS else CORS_ALLOW_ORIGINS,  # Restrict in production
+    # Credentials can't be combined with a wildcard origin (Fetch spec); only allow them for explicit origins
+    allow_credentials=not CORS_ALLOW_ALL_ORIGINS,
+    allow_methods=["GET", "POST", "PUT", "DELETE"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
 # Dependency to get DB session
-def get_db() -> Session:
-    db = database.SessionLocal()
+async def get_db(request: Request) -> AsyncIterator[AsyncSession]:
+    db = request.app.state.sessionmaker()
     try:
         yield db
     finally:
-        db.close()
+        await db.close()
+
+# Dependency to get the product loader
+def get_product_loader(request: Request) -> ProductLoader:
+    return request.app.state.product_loader
+
+def _product_etag(product: Dict[str, Any]) -> str:
+    # Weak validator: changes whenever the row's updated_at does
+    return f'W/"{product["id"]}-{int(product["updated_at"].timestamp() * 1_000_000)}"'
+
+def _etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so the W/ prefix is ignored
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
 
 # Exception handler for SQLAlchemy errors
 @app.exception_handler(SQLAlchemyError)
 async def sqlalchemy_exception_handler(request, exc: SQLAlchemyError):
-    logger.error(f"Database error: {exc}")
-    return JSONResponse(
+    logger.error("Database error: %s", exc)
+    return APIJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={"detail": "Internal database error."}
     )
 
 # Health check endpoint
 @app.get("/health", tags=["Health"], summary="Health check endpoint")
-def health_check():
+async def health_check():
     """
     Returns API health status.
     """
     return {"status": "ok"}
 
+@app.get("/health/pool", tags=["Health"], summary="Database connection pool status")
+async def pool_status(request: Request):
+    """
+    Returns database connection pool usage (checked in/out, overflow).
+    """
+    return database.get_pool_status(request.app.state.engine)
+
 # Product CRUD endpoints
 
 @app.post(
@@ -65,51 +138,111 @@ def health_check():
     tags=["Products"],
     summary="Create a new product"
 )
-def create_product(
+async def create_product(
     product: schemas.ProductCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Create a new product with validated data.
     """
     try:
-        db_product = crud.create_product(db=db, product=product)
-        logger.info(f"Product created: {db_product.id}")
+        db_product = await crud.create_product(db=db, product=product)
+        logger.info("Product created: %s", db_product.id)
         return db_product
     except crud.ProductAlreadyExistsError as e:
-        logger.warning(f"Product creation failed: {e}")
+        logger.warning("Product creation failed: %s", e)
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=str(e)
         )
     except Exception as e:
-        logger.error(f"Unexpected error during product creation: {e}")
+        logger.error("Unexpected error during product creation: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create product."
         )
 
+@app.post(
+    "/products/bulk",
+    response_model=None,
+    responses={status.HTTP_201_CREATED: {"model": List[schemas.Product]}},
+    status_code=status.HTTP_201_CREATED,
+    tags=["Products"],
+    summary="Create several products"
+)
+async def create_products_bulk(
+    products: schemas.ProductBulkCreate,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create up to 1000 products in one request.
+    Products whose name already exists are skipped; only created products are returned.
+    """
+    try:
+        created = await crud.create_products_bulk(db=db, products=products)
+        logger.info("Bulk created %s products.", len(created))
+        return APIJSONResponse(created, status_code=status.HTTP_201_CREATED)
+    except Exception as e:
+        logger.error("Unexpected error during bulk product creation: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to create products."
+        )
+
+@app.put(
+    "/products/bulk",
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": List[schemas.Product]}},
+    status_code=status.HTTP_200_OK,
+    tags=["Products"],
+    summary="Create or update several products by name"
+)
+async def upsert_products_bulk(
+    products: schemas.ProductBulkCreate,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create up to 1000 products in one request, replacing the description and price
+    of products whose name already exists.
+    """
+    try:
+        upserted = await crud.upsert_products_bulk(db=db, products=products)
+        logger.info("Bulk upserted %s products.", len(upserted))
+        return APIJSONResponse(upserted)
+    except Exception as e:
+        logger.error("Unexpected error during bulk product upsert: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to update products."
+        )
+
 @app.get(
     "/products/",
-    response_model=List[schemas.Product],
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": List[schemas.Product]}},
     status_code=status.HTTP_200_OK,
     tags=["Products"],
     summary="List all products"
 )
-def list_products(
+async def list_products(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    after_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Retrieve a list of products with pagination.
+
+    Pass the `X-Next-Cursor` header of a page as `after_id` to fetch the next one.
     """
     try:
-        products = crud.get_products(db=db, skip=skip, limit=limit)
-        logger.info(f"Retrieved {len(products)} products.")
-        return products
+        # Rows come straight from the database, so response model validation is skipped
+        products = await crud.get_products_raw(db=db, skip=skip, limit=limit, after_id=after_id)
+        headers = {"X-Next-Cursor": str(products[-1]["id"])} if products else None
+        logger.info("Retrieved %s products.", len(products))
+        return APIJSONResponse(products, headers=headers)
     except Exception as e:
-        logger.error(f"Error retrieving products: {e}")
+        logger.error("Error retrieving products: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve products."
@@ -122,21 +255,29 @@ def list_products(
     tags=["Products"],
     summary="Get a product by ID"
 )
-def get_product(
+async def get_product(
     product_id: int,
-    db: Session = Depends(get_db)
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    loader: ProductLoader = Depends(get_product_loader)
 ):
     """
     Retrieve a product by its unique ID.
+
+    Responses carry an `ETag`; send it back as `If-None-Match` to get `304 Not Modified`.
     """
-    product = crud.get_product(db=db, product_id=product_id)
+    product = await loader.load(product_id)
     if not product:
-        logger.warning(f"Product not found: {product_id}")
+        logger.warning("Product not found: %s", product_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product not found."
         )
-    logger.info(f"Product retrieved: {product_id}")
+    etag = _product_etag(product)
+    if _etag_matches(etag, if_none_match):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    logger.info("Product retrieved: %s", product_id)
     return product
 
 @app.put(
@@ -146,26 +287,34 @@ def get_product(
     tags=["Products"],
     summary="Update a product by ID"
 )
-def update_product(
+async def update_product(
     product_id: int,
     product_update: schemas.ProductUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Update an existing product by its ID.
     """
     try:
-        updated_product = crud.update_product(db=db, product_id=product_id, product_update=product_update)
+        updated_product = await crud.update_product(db=db, product_id=product_id, product_update=product_update)
         if not updated_product:
-            logger.warning(f"Product not found for update: {product_id}")
+            logger.warning("Product not found for update: %s", product_id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Product not found."
             )
-        logger.info(f"Product updated: {product_id}")
+        logger.info("Product updated: %s", product_id)
         return updated_product
+    except HTTPException:
+        raise
+    except crud.ProductAlreadyExistsError as e:
+        logger.warning("Product update failed: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
     except Exception as e:
-        logger.error(f"Error updating product {product_id}: {e}")
+        logger.error("Error updating product %s: %s", product_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update product."
@@ -177,29 +326,32 @@ def update_product(
     tags=["Products"],
     summary="Delete a product by ID"
 )
-def delete_product(
+async def delete_product(
     product_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Delete a product by its unique ID.
     """
     try:
-        deleted = crud.delete_product(db=db, product_id=product_id)
+        deleted = await crud.delete_product(db=db, product_id=product_id)
         if not deleted:
-            logger.warning(f"Product not found for deletion: {product_id}")
+            logger.warning("Product not found for deletion: %s", product_id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Product not found."
             )
-        logger.info(f"Product deleted: {product_id}")
+        logger.info("Product deleted: %s", product_id)
         return
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error deleting product {product_id}: {e}")
+        logger.error("Error deleting product %s: %s", product_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to delete product."
         )
 
 # Exported: FastAPI app instance
-# Usage: uvicorn src.api.main:app --host 0.0.0.0 --port 8000
\ No newline at end of file
+# Usage: uvicorn src.api.main:app --host 0.0.0.0 --port 8000 --loop uvloop --http httptools \
+#            --workers $(nproc) --backlog 4096 --limit-concurrency 1024 --timeout-keep-alive 30
\ No newline at end of file
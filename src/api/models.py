@@ -10,8 +10,12 @@ class Product(Base):
     Represents a product in the Cloud DevOps Automation Platform.
     """
     __tablename__ = "products"
+    # Fetch server-generated columns via INSERT/UPDATE ... RETURNING instead of a follow-up SELECT
+    __mapper_args__ = {"eager_defaults": True}
 
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    # The primary key index serves lookups by ID and keyset pagination (ORDER BY id);
+    # a separate index=True would only duplicate it and slow down inserts.
+    id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String(255), nullable=False, unique=True, index=True)
     description = Column(Text, nullable=True)
     price = Column(Numeric(10, 2), nullable=False)
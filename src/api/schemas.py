@@ -1,65 +1,61 @@
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import Annotated, List, Optional
 
-from pydantic import BaseModel, Field, constr, condecimal, validator
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
+
+# Constrained field types; constraints are enforced by pydantic-core without Python validators
+ProductName = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=255)]
+ProductDescription = Annotated[str, StringConstraints(max_length=10000)]
+ProductPrice = Annotated[Decimal, Field(gt=0, max_digits=10, decimal_places=2)]
 
 class ProductBase(BaseModel):
     """
     Shared properties for Product.
     """
-    name: constr(strip_whitespace=True, min_length=1, max_length=255) = Field(
+    name: ProductName = Field(
         ..., description="Unique name of the product"
     )
-    description: Optional[str] = Field(
-        None, description="Optional description of the product"
+    description: Optional[ProductDescription] = Field(
+        None, description="Optional description of the product (max 10000 characters)"
     )
-    price: condecimal(gt=0, max_digits=10, decimal_places=2) = Field(
+    price: ProductPrice = Field(
         ..., description="Price of the product (must be positive)"
     )
 
-    @validator("description")
-    def description_length(cls, v):
-        if v is not None and len(v) > 10000:
-            raise ValueError("Description is too long (max 10000 characters).")
-        return v
-
 class ProductCreate(ProductBase):
     """
     Schema for creating a new Product.
     """
     pass
 
+# Request body for bulk endpoints; bounded to keep a single statement's bind parameters in check
+MAX_BULK_PRODUCTS = 1000
+ProductBulkCreate = Annotated[List[ProductCreate], Field(min_length=1, max_length=MAX_BULK_PRODUCTS)]
+
 class ProductUpdate(BaseModel):
     """
     Schema for updating an existing Product.
     All fields are optional.
     """
-    name: Optional[constr(strip_whitespace=True, min_length=1, max_length=255)] = Field(
+    name: Optional[ProductName] = Field(
         None, description="Unique name of the product"
     )
-    description: Optional[str] = Field(
-        None, description="Optional description of the product"
+    description: Optional[ProductDescription] = Field(
+        None, description="Optional description of the product (max 10000 characters)"
     )
-    price: Optional[condecimal(gt=0, max_digits=10, decimal_places=2)] = Field(
+    price: Optional[ProductPrice] = Field(
         None, description="Price of the product (must be positive)"
     )
 
-    @validator("description")
-    def description_length(cls, v):
-        if v is not None and len(v) > 10000:
-            raise ValueError("Description is too long (max 10000 characters).")
-        return v
-
 class Product(ProductBase):
     """
     Schema for returning a Product from the API.
     """
+    model_config = ConfigDict(from_attributes=True)
+
     id: int = Field(..., description="Unique identifier of the product")
     created_at: datetime = Field(..., description="Timestamp when the product was created")
     updated_at: datetime = Field(..., description="Timestamp when the product was last updated")
 
-    class Config:
-        orm_mode = True
-
-# Exported: ProductBase, ProductCreate, ProductUpdate, Product
\ No newline at end of file
+# Exported: ProductBase, ProductCreate, ProductBulkCreate, ProductUpdate, Product
\ No newline at end of file